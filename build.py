@@ -59,6 +59,21 @@ def create_distribution(dist_path: t.Optional[str]):
         yield None
 
 
+def generate_props_txt_parser():
+    print_info('\nGenerating standalone props.txt parser...')
+
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(filter(None, (os.path.abspath('umodel_tools/third_party'),
+                                                      env.get('PYTHONPATH'))))
+
+    status = subprocess.call([PYTHON_PATH, '-m', 'lark.tools.standalone', '--propagate_positions',
+                              '--maybe_placeholders', '-o', 'umodel_tools/props_txt_standalone.py',
+                              'umodel_tools/props_txt_grammar.lark'], env=env)
+    if status:
+        print_info("Warning: failed generating standalone props.txt parser. See error above. "
+                   "The parser will be built from the grammar at runtime.")
+
+
 def build_project(no_req: bool, dist_path: t.Optional[str]):
     start_time = time.time()
 
@@ -81,6 +96,8 @@ def build_project(no_req: bool, dist_path: t.Optional[str]):
         else:
             print_info("Warning: Third-party Python modules will not be installed. (--noreq option)")
 
+        generate_props_txt_parser()
+
     print_success("UmodelTools building finished successfully.",
                   "Total build time: ", time.strftime("%M minutes %S seconds\a", time.gmtime(time.time() - start_time)))
 
@@ -9,7 +9,9 @@ class AssetDB:
 
     _version: int
     _catalogs: dict[str, tuple[str, str]]
+    _catalog_uids: dict[str, str]
     _db_cats_path: str
+    _has_unsaved_changes: bool
 
     def __init__(self, db_root_path: str) -> None:
         """Initialize ``AssetDB``.
@@ -18,6 +20,8 @@ class AssetDB:
         """
         self._version = 1
         self._catalogs = {}
+        self._catalog_uids = {}
+        self._has_unsaved_changes = False
         self._db_cats_path = os.path.join(db_root_path, 'blender_assets.cats.txt')
 
         self._open_db(db_root_path)
@@ -45,6 +49,7 @@ class AssetDB:
                     if len(components := line.split(':')) == 3:
                         uid, full_path, simple_path = components
                         self._catalogs[uid] = full_path, simple_path
+                        self._catalog_uids.setdefault(full_path, uid)
                     elif len(components := line.split(' ')) == 2 and components[0] == 'VERSION':
                         self._version = components[1]
                     else:
@@ -59,21 +64,26 @@ class AssetDB:
         dir_path = dir_path.replace('\\', '/')
 
         # search already existing UID
-        for uid, (full_path, _) in self._catalogs.items():
-            if full_path == dir_path:
-                return uid
+        if (uid := self._catalog_uids.get(dir_path)) is not None:
+            return uid
 
         # generate new entry
-        uid = uuid.uuid1()
-        assert uid.variant == uuid.RFC_4122
+        new_uid = uuid.uuid1()
+        assert new_uid.variant == uuid.RFC_4122
 
-        self._catalogs[str(uid)] = dir_path, dir_path.replace('/', '-')
+        uid = str(new_uid)
+        self._catalogs[uid] = dir_path, dir_path.replace('/', '-')
+        self._catalog_uids[dir_path] = uid
+        self._has_unsaved_changes = True
 
-        return str(uid)
+        return uid
 
     def save_db(self) -> None:
-        """Save changes in the data base to disk.
+        """Save changes in the data base to disk. Does nothing if no catalogs were added since the last save.
         """
+        if not self._has_unsaved_changes:
+            return
+
         if not os.path.exists(self._db_cats_path):
             os.makedirs(os.path.dirname(self._db_cats_path), exist_ok=True)
 
@@ -85,3 +95,5 @@ class AssetDB:
 
         # write backup copy (required for Blender to not consider changes temporary)
         shutil.copyfile(self._db_cats_path, f"{self._db_cats_path}~")
+
+        self._has_unsaved_changes = False
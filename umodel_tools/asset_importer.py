@@ -13,6 +13,7 @@ from . import utils
 from . import asset_db
 from . import props_txt_parser
 from . import game_profiles
+from . import shader_nodes
 
 
 class AssetImporter:
@@ -48,6 +49,17 @@ class AssetImporter:
 
     _has_warnings: bool = False
 
+    #: Names of template materials holding the base node graph, keyed by (PBR, special blending mode).
+    _material_templates: dict[tuple[bool, t.Optional[enums.SpecialBlendingMode]], str] = {}
+
+    #: Directories known to exist in the asset library during the current import.
+    _ensured_dirs: set[str] = set()
+
+    #: Names of the base graph nodes in template materials.
+    _OUTPUT_NODE_NAME = "Material Output"
+    _BSDF_NODE_NAME = "BSDF"
+    _AO_MIX_NODE_NAME = "AO Mix"
+
     def _op_message(self, msg_type: t.Literal['INFO'] | t.Literal['ERROR'] | t.Literal['WARNING'], msg: str):
         """Print operator message and return the associated status-code.
 
@@ -82,14 +94,23 @@ class AssetImporter:
             print(self._unrecognized_texture_types)
             self._unrecognized_texture_types.clear()
 
+    def _ensure_dir(self, dir_path: str) -> None:
+        """Create a directory (and its parents) unless it was already created or found during this import.
+
+        :param dir_path: Directory path.
+        """
+        if dir_path not in self._ensured_dirs:
+            os.makedirs(dir_path, exist_ok=True)
+            self._ensured_dirs.add(dir_path)
+
     def _load_asset(self,
                     context: bpy.types.Context,
                     asset_dir: str,
                     asset_path: str,
                     umodel_export_dir: str,
                     game_profile: str,
-                    load: bool = True,
-                    db: t.Optional[asset_db.AssetDB] = None
+                    db: asset_db.AssetDB,
+                    load: bool = True
                     ) -> bpy.types.Object | None:
         """Loads the asset from library dir, or adds it to library and loads it.
 
@@ -98,9 +119,8 @@ class AssetImporter:
         :param asset_path: Asset path in game format.
         :param umodel_export_dir: UModel output directory.
         :param game_profile: Game profile to import.
+        :param db: Asset database to operate on. Changes are kept in memory, saving is up to the caller.
         :param load: If False, the asset will be imported to the library, but no the current scene.
-        :param db: Asset database to operate on. If given, no saving is performed, else the function handles
-        everything by itself.
         :return: Object reference or None (if object was not found or failed loading due to filesystem errors).
         :raises NotImplementedError: Raised when requested game profile is not implemented or available.
         """
@@ -118,9 +138,10 @@ class AssetImporter:
 
                 with utils.redirect_cstdout():
                     with bpy.data.libraries.load(asset_path_abs, link=True) as (data_from, data_to):
-                        data_to.objects = list(data_from.objects)
+                        data_to.objects = data_from.objects
                         assert len(data_to.objects) == 1
 
+                    utils.index_linked_library(data_to.objects[0].library)
                     return data_to.objects[0]
 
             return None
@@ -132,16 +153,18 @@ class AssetImporter:
     def _import_image_to_library(self,
                                  tex_path: str,
                                  tex_lib_path: str,
+                                 tex_lib_blend_path: str,
                                  tex_umodel_path: str,
                                  db: asset_db.AssetDB):
         """Import image texture to asset library from UModel output.
 
         :param tex_path: Path to texture in game format.````
         :param tex_lib_path: Path to texture in the library dir (absolute).
+        :param tex_lib_blend_path: Path to the texture's .blend library in the library dir (absolute).
         :param tex_umodel_path: Path to texture in the UModel output dir (absolute).
         """
         # copy file to library dir
-        os.makedirs(os.path.dirname(tex_lib_path), exist_ok=True)
+        self._ensure_dir(os.path.dirname(tex_lib_path))
         shutil.copyfile(tex_umodel_path, tex_lib_path)
 
         img = bpy.data.images.load(filepath=tex_lib_path)
@@ -149,14 +172,107 @@ class AssetImporter:
         img.asset_data.catalog_id = db.uid_for_entry(os.path.dirname(tex_path))
         # img.asset_generate_preview()
 
-        tex_lib_blend_path = os.path.splitext(tex_lib_path)[0] + '.blend'
-
         # write texture library
         bpy.data.libraries.write(tex_lib_blend_path, {img, }, fake_user=True, compress=True)
 
         # remove original datablock
         bpy.data.images.remove(img, do_unlink=True)
 
+    def _build_material_template(self,
+                                 template: bpy.types.Material,
+                                 special_blend_mode: t.Optional[enums.SpecialBlendingMode]) -> None:
+        """Build the base shader node graph (output, BSDF, AO mixing and blending nodes) of a template material.
+
+        :param template: Template material.
+        :param special_blend_mode: Blending mode requiring additional node logic, or None.
+        """
+        template.use_nodes = True
+
+        nodes = template.node_tree.nodes
+        links = template.node_tree.links
+        links.clear()
+        nodes.clear()
+
+        out = nodes.new('ShaderNodeOutputMaterial')
+        out.name = self._OUTPUT_NODE_NAME
+
+        if self.load_pbr_maps:
+            # create basic shader nodes and set their default values
+            bsdf = nodes.new('ShaderNodeBsdfPrincipled')
+
+            ao_mix = nodes.new('ShaderNodeMix')
+            ao_mix.name = self._AO_MIX_NODE_NAME
+            ao_mix.data_type = 'RGBA'
+            ao_mix.blend_type = 'MULTIPLY'
+            ao_mix.inputs[shader_nodes.MIX_RGBA_INPUT_A].default_value = (1, 1, 1, 1)
+            ao_mix.inputs[shader_nodes.MIX_RGBA_INPUT_B].default_value = (1, 1, 1, 1)
+            links.new(ao_mix.outputs[shader_nodes.MIX_RGBA_OUTPUT], bsdf.inputs['Base Color'])
+
+            # in order to simulate some blending modes special node logic is required
+            match special_blend_mode:
+                case None:
+                    links.new(bsdf.outputs['BSDF'], out.inputs['Surface'])
+                case enums.SpecialBlendingMode.Add:
+                    transparent_bsdf = nodes.new('ShaderNodeBsdfTransparent')
+                    add_shader = nodes.new('ShaderNodeAddShader')
+
+                    links.new(bsdf.outputs['BSDF'], add_shader.inputs[0])
+                    links.new(transparent_bsdf.outputs['BSDF'], add_shader.inputs[1])
+                    links.new(add_shader.outputs[0], out.inputs['Surface'])
+
+                case enums.SpecialBlendingMode.Mod:
+                    shader_to_rgb = nodes.new('ShaderNodeShaderToRGB')
+                    transparent_bsdf = nodes.new('ShaderNodeBsdfTransparent')
+                    links.new(bsdf.outputs['BSDF'], shader_to_rgb.inputs[0])
+                    links.new(shader_to_rgb.outputs['Color'], transparent_bsdf.inputs['Color'])
+                    links.new(transparent_bsdf.outputs['BSDF'], out.inputs['Surface'])
+        else:
+            bsdf = nodes.new('ShaderNodeBsdfDiffuse')
+            links.new(bsdf.outputs['BSDF'], out.inputs['Surface'])
+
+        bsdf.name = self._BSDF_NODE_NAME
+
+    def _new_material(self,
+                      material_name: str,
+                      special_blend_mode: t.Optional[enums.SpecialBlendingMode]
+                      ) -> tuple[bpy.types.Material,
+                                 bpy.types.ShaderNodeOutputMaterial,
+                                 bpy.types.ShaderNodeBsdfPrincipled | bpy.types.ShaderNodeBsdfDiffuse,
+                                 t.Optional[bpy.types.ShaderNodeMix]]:
+        """Create a new material with the base shader node graph. The graph is built once per configuration
+        into a template material, new materials are copies of it.
+
+        :param material_name: Name of the new material.
+        :param special_blend_mode: Blending mode requiring additional node logic, or None.
+        :return: New material, its output node, BSDF node and AO mixing node (None if PBR maps are not loaded).
+        """
+        template_key = (self.load_pbr_maps, special_blend_mode)
+
+        template_name = self._material_templates.get(template_key)
+
+        if template_name is None or (template := bpy.data.materials.get(template_name)) is None:
+            template = bpy.data.materials.new("UMT_Template")
+            self._build_material_template(template, special_blend_mode)
+            self._material_templates[template_key] = template.name
+
+        new_mat = template.copy()
+        new_mat.name = material_name
+
+        nodes = new_mat.node_tree.nodes
+        ao_mix = nodes[self._AO_MIX_NODE_NAME] if self.load_pbr_maps else None
+
+        return new_mat, nodes[self._OUTPUT_NODE_NAME], nodes[self._BSDF_NODE_NAME], ao_mix
+
+    def _release_material_templates(self) -> None:
+        """Remove template materials created while importing. Must be called once the operator is done,
+        regardless of whether the import succeeded.
+        """
+        for template_name in self._material_templates.values():
+            if (template := bpy.data.materials.get(template_name)) is not None:
+                bpy.data.materials.remove(template, do_unlink=True)
+
+        self._material_templates.clear()
+
     def _import_material_to_library(self,
                                     material_name: str,
                                     material_path_local: str,
@@ -181,47 +297,46 @@ class AssetImporter:
         if game_profile_impl is None:
             raise NotImplementedError(f"Requested game profile {game_profile} is not implemented/available.")
 
-        material_path_local_no_ext = os.path.splitext(os.path.splitext(material_path_local)[0])[0]  # remove .props.txt
+        material_path_local_no_ext = material_path_local.removesuffix('.props.txt')
 
         # load texture infos, may throw OSError if file is not found.
         # pylint: disable=unpacking-non-sequence
         desc_ast, texture_infos, base_prop_overrides = props_txt_parser.parse_props_txt(os.path.join(umodel_export_dir,
                                                                                         material_path_local),
                                                                                         mode='MATERIAL')
-        new_mat = bpy.data.materials.new(material_name)
+        special_blend_mode = None
+        blend_method = None
+
+        if (self.load_pbr_maps and base_prop_overrides is not None
+           and (blend_mode := base_prop_overrides.get('BlendMode')) is not None):
+            match blend_mode:
+                case 'BLEND_Opaque (0)':
+                    pass
+                case 'BLEND_Masked (1)':
+                    blend_method = 'CLIP'
+                case 'BLEND_Translucent (2)':
+                    blend_method = 'BLEND'
+                case 'BLEND_Additive (3)':
+                    special_blend_mode = enums.SpecialBlendingMode.Add
+                    blend_method = 'BLEND'
+                case 'BLEND_Modulate (4)':
+                    special_blend_mode = enums.SpecialBlendingMode.Mod
+                    blend_method = 'BLEND'
+                case _:
+                    self._warn_print(f"Warning: Unknown blending mode \'{blend_mode}\' found on importing "
+                                     f"material \"{material_name}\".")
+
+        new_mat, out, bsdf, ao_mix = self._new_material(material_name, special_blend_mode)
         new_mat.asset_mark()
         new_mat.asset_data.catalog_id = db.uid_for_entry(material_path_local_no_ext)
-        new_mat.use_nodes = True
-        new_mat.node_tree.links.clear()
-        new_mat.node_tree.nodes.clear()
         game_profile_impl.process_material(mat=new_mat, desc_ast=desc_ast, use_pbr=self.load_pbr_maps)
 
-        out = new_mat.node_tree.nodes.new('ShaderNodeOutputMaterial')
-
+        # set various material parameters
         if self.load_pbr_maps:
-            special_blend_mode = None
+            if blend_method is not None:
+                new_mat.blend_method = blend_method
 
-            # set various material parameters
             if base_prop_overrides is not None:
-
-                if (blend_mode := base_prop_overrides.get('BlendMode')) is not None:
-                    match blend_mode:
-                        case 'BLEND_Opaque (0)':
-                            pass
-                        case 'BLEND_Masked (1)':
-                            new_mat.blend_method = 'CLIP'
-                        case 'BLEND_Translucent (2)':
-                            new_mat.blend_method = 'BLEND'
-                        case 'BLEND_Additive (3)':
-                            special_blend_mode = enums.SpecialBlendingMode.Add
-                            new_mat.blend_method = 'BLEND'
-                        case 'BLEND_Modulate (4)':
-                            special_blend_mode = enums.SpecialBlendingMode.Mod
-                            new_mat.blend_method = 'BLEND'
-                        case _:
-                            self._warn_print(f"Warning: Unknown blending mode \'{blend_mode}\' found on importing "
-                                             f"material \"{material_name}\".")
-
                 if self.import_backface_culling and (two_sided := base_prop_overrides.get('TwoSided')) is not None:
                     new_mat.use_backface_culling = not two_sided
 
@@ -231,37 +346,7 @@ class AssetImporter:
             elif self.import_backface_culling:
                 new_mat.use_backface_culling = True
 
-            # create basic shader nodes and set their default values
-            bsdf = new_mat.node_tree.nodes.new('ShaderNodeBsdfPrincipled')
-
-            ao_mix = new_mat.node_tree.nodes.new('ShaderNodeMix')
-            ao_mix.data_type = 'RGBA'
-            ao_mix.blend_type = 'MULTIPLY'
-            ao_mix.inputs[6].default_value = (1, 1, 1, 1)
-            ao_mix.inputs[7].default_value = (1, 1, 1, 1)
-            new_mat.node_tree.links.new(ao_mix.outputs[2], bsdf.inputs['Base Color'])
-
-            # in order to simulate some blending modes special node logic is required
-            match special_blend_mode:
-                case None:
-                    new_mat.node_tree.links.new(bsdf.outputs['BSDF'], out.inputs['Surface'])
-                case enums.SpecialBlendingMode.Add:
-                    transparent_bsdf = new_mat.node_tree.nodes.new('ShaderNodeBsdfTransparent')
-                    add_shader = new_mat.node_tree.nodes.new('ShaderNodeAddShader')
-
-                    new_mat.node_tree.links.new(bsdf.outputs['BSDF'], add_shader.inputs[0])
-                    new_mat.node_tree.links.new(transparent_bsdf.outputs['BSDF'], add_shader.inputs[1])
-                    new_mat.node_tree.links.new(add_shader.outputs[0], out.inputs['Surface'])
-
-                case enums.SpecialBlendingMode.Mod:
-                    shader_to_rgb = new_mat.node_tree.nodes.new('ShaderNodeShaderToRGB')
-                    transparent_bsdf = new_mat.node_tree.nodes.new('ShaderNodeBsdfTransparent')
-                    new_mat.node_tree.links.new(bsdf.outputs['BSDF'], shader_to_rgb.inputs[0])
-                    new_mat.node_tree.links.new(shader_to_rgb.outputs['Color'], transparent_bsdf.inputs['Color'])
-                    new_mat.node_tree.links.new(transparent_bsdf.outputs['BSDF'], out.inputs['Surface'])
-        else:
-            bsdf = new_mat.node_tree.nodes.new('ShaderNodeBsdfDiffuse')
-            new_mat.node_tree.links.new(bsdf.outputs['BSDF'], out.inputs['Surface'])
+        nodes = new_mat.node_tree.nodes
 
         for tex_type, tex_path_and_name in texture_infos.items():
             tex_path_no_ext, tex_short_name = os.path.splitext(tex_path_and_name)
@@ -276,22 +361,21 @@ class AssetImporter:
                 continue
 
             # normalize path from config
-            tex_path_no_ext = os.path.normpath(tex_path_no_ext)
-
-            # remove leading separator
-            tex_path_no_ext = tex_path_no_ext[1:] if tex_path_no_ext.startswith(os.sep) else tex_path_no_ext
+            tex_path_no_ext = utils.normalize_game_path(tex_path_no_ext)
 
             tex_path = tex_path_no_ext + self.texture_format
             tex_path_abs = os.path.join(umodel_export_dir, tex_path)
 
-            tex_lib_path = os.path.join(asset_library_dir, tex_path)
-            tex_lib_blend_path = os.path.splitext(tex_lib_path)[0] + '.blend'
+            tex_lib_path_no_ext = os.path.join(asset_library_dir, tex_path_no_ext)
+            tex_lib_path = tex_lib_path_no_ext + self.texture_format
+            tex_lib_blend_path = tex_lib_path_no_ext + '.blend'
 
             # check if texture is not already in the library
             if not os.path.isfile(tex_lib_blend_path):
                 if os.path.isfile(tex_path_abs):
                     self._import_image_to_library(tex_path=tex_path,
                                                   tex_lib_path=tex_lib_path,
+                                                  tex_lib_blend_path=tex_lib_blend_path,
                                                   tex_umodel_path=tex_path_abs,
                                                   db=db)
                 else:
@@ -304,11 +388,12 @@ class AssetImporter:
                 with utils.redirect_cstdout():
                     with bpy.data.libraries.load(filepath=tex_lib_blend_path, link=True) as (data_from, data_to):
                         # we assume there is exactly one texture we have just written there
-                        data_to.images = [data_from.images[0]]
+                        data_to.images = data_from.images[:1]
 
                     img = data_to.images[0]
+                    utils.index_linked_library(img.library)
 
-            img_node = new_mat.node_tree.nodes.new('ShaderNodeTexImage')
+            img_node = nodes.new('ShaderNodeTexImage')
             img_node.image = img
 
             if self.load_pbr_maps:
@@ -331,7 +416,7 @@ class AssetImporter:
         game_profile_impl.end_process_material(new_mat)
 
         material_lib_path = os.path.join(asset_library_dir, material_path_local_no_ext) + '.blend'
-        os.makedirs(os.path.dirname(material_lib_path), exist_ok=True)
+        self._ensure_dir(os.path.dirname(material_lib_path))
         bpy.data.libraries.write(filepath=material_lib_path, datablocks={new_mat, }, fake_user=True)
         bpy.data.materials.remove(new_mat, do_unlink=True)
 
@@ -341,7 +426,7 @@ class AssetImporter:
                                  asset_path: str,
                                  umodel_export_dir: str,
                                  game_profile: str,
-                                 db: t.Optional[asset_db.AssetDB] = None
+                                 db: asset_db.AssetDB
                                  ) -> None:
         """Import asset (mesh) to an assset library from UModel output.
 
@@ -350,24 +435,19 @@ class AssetImporter:
         :param asset_path: Path to the asset in game format.
         :param umodel_export_dir: UModel output directory to source .psk files from.
         :param game_profile: Game profile to import.
-        :param db: Asset database to operate on. If given, no saving is performed, else the function handles
-        everything by itself.
+        :param db: Asset database to operate on. Changes are kept in memory, saving is up to the caller.
         :raises OSError: Raised when an asset was not found in the UModel output dir or failed opening.
         :raises FileNotFounderror: Raised when an asset was not found in the directory.
         :raises RuntimeError: Raised when an asset failed importing due to unknown .psk/.pskx importer issue.
         :raises NotImplementedError: Raised when requested game profile is not implemented or available.
         """
 
-        has_external_db = db is not None
-        if db is None:
-            db = asset_db.AssetDB(asset_library_dir)
-
         asset_local_dir = os.path.dirname(asset_path)
         catalog_uid = db.uid_for_entry(asset_local_dir) if asset_local_dir else None
         asset_absolute_dir = os.path.join(asset_library_dir, asset_local_dir)
         asset_path_local_noext = os.path.splitext(asset_path)[0]
 
-        os.makedirs(asset_absolute_dir, exist_ok=True)
+        self._ensure_dir(asset_absolute_dir)
 
         asset_psk_path_noext = os.path.join(umodel_export_dir, asset_path_local_noext)
 
@@ -425,7 +505,7 @@ class AssetImporter:
                             if not file.endswith('.props.txt'):
                                 continue
 
-                            file_abs = os.path.splitext(os.path.splitext(os.path.join(root, file))[0])[0]
+                            file_abs = os.path.join(root, file.removesuffix('.props.txt'))
                             mat_name = os.path.basename(file_abs)
 
                             if mat_name not in mat_desc_order_map:
@@ -464,11 +544,7 @@ class AssetImporter:
                 material_name = material_name[1:]  # removing the .
 
                 # normalize path from config
-                material_path_local_no_ext = os.path.normpath(material_path_local_no_ext)
-
-                # remove leading separator
-                material_path_local_no_ext = material_path_local_no_ext[1:] \
-                    if material_path_local_no_ext.startswith(os.sep) else material_path_local_no_ext
+                material_path_local_no_ext = utils.normalize_game_path(material_path_local_no_ext)
 
                 material_path_local = material_path_local_no_ext + '.props.txt'
                 material_lib_path = os.path.join(asset_library_dir, material_path_local_no_ext) + '.blend'
@@ -488,9 +564,10 @@ class AssetImporter:
                         with utils.redirect_cstdout():
                             with bpy.data.libraries.load(filepath=material_lib_path, link=True) as (data_from, data_to):
                                 # we presume there is exactly one material in the library, no validation performed
-                                data_to.materials = [data_from.materials[0]]
+                                data_to.materials = data_from.materials[:1]
 
                             new_mat = data_to.materials[0]
+                            utils.index_linked_library(new_mat.library)
 
                 except FileNotFoundError as e:
                     new_mat = bpy.data.materials.new(f"{material_name}_Placeholder")
@@ -519,7 +596,7 @@ class AssetImporter:
         # obj.asset_generate_preview()
 
         asset_abs_lib_path = os.path.join(asset_library_dir, asset_path_local_noext) + '.blend'
-        os.makedirs(os.path.dirname(asset_abs_lib_path), exist_ok=True)
+        self._ensure_dir(os.path.dirname(asset_abs_lib_path))
         bpy.data.libraries.write(asset_abs_lib_path, {obj, }, fake_user=True)
 
         # cleanup
@@ -532,6 +609,3 @@ class AssetImporter:
                 bpy.data.materials.remove(mat, do_unlink=True)
             except ReferenceError:
                 pass
-
-        if not has_external_db:
-            db.save_db()
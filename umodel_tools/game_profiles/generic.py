@@ -8,6 +8,8 @@ import dataclasses
 import bpy
 import lark
 
+from .. import shader_nodes
+
 
 GAME_NAME = "Generic"
 GAME_DESCRIPTION = "Provides basic support for any Unreal Engine game"
@@ -70,6 +72,9 @@ def handle_material_texture_pbr(mat: bpy.types.Material,
     mat_ctx = _state_buffer[mat]
     mat_ctx.bsdf_node = bsdf_node
 
+    nodes = mat.node_tree.nodes
+    links = mat.node_tree.links
+
     bl_tex_type = _short_name_to_tex_type(tex_short_name)
 
     # do not connect the same texture twice
@@ -81,43 +86,39 @@ def handle_material_texture_pbr(mat: bpy.types.Material,
 
     match bl_tex_type:
         case TextureMapTypes.Diffuse:
-            mat.node_tree.links.new(img_node.outputs['Color'], ao_mix_node.inputs[6])
-            mat.node_tree.links.new(img_node.outputs['Alpha'], bsdf_node.inputs['Alpha'])
+            links.new(img_node.outputs['Color'], ao_mix_node.inputs[shader_nodes.MIX_RGBA_INPUT_A])
+            links.new(img_node.outputs['Alpha'], bsdf_node.inputs['Alpha'])
             img_node.select = True
-            mat.node_tree.nodes.active = img_node
+            nodes.active = img_node
 
         case TextureMapTypes.Normal:
-            normal_map_node = mat.node_tree.nodes.new('ShaderNodeNormalMap')
-            mat.node_tree.links.new(normal_map_node.outputs['Normal'],
-                                    bsdf_node.inputs['Normal'])
-            mat.node_tree.links.new(img_node.outputs['Color'],
-                                    normal_map_node.inputs['Color'])
+            normal_map_node = nodes.new('ShaderNodeNormalMap')
+            links.new(normal_map_node.outputs['Normal'], bsdf_node.inputs['Normal'])
+            links.new(img_node.outputs['Color'], normal_map_node.inputs['Color'])
         case TextureMapTypes.SRO:
-            sro_split = mat.node_tree.nodes.new('ShaderNodeSeparateColor')
-            mat.node_tree.links.new(sro_split.outputs['Red'], bsdf_node.inputs['Specular'])
-            mat.node_tree.links.new(sro_split.outputs['Green'], bsdf_node.inputs['Roughness'])
-            mat.node_tree.links.new(sro_split.outputs['Blue'], ao_mix_node.inputs[7])
-            mat.node_tree.links.new(img_node.outputs['Color'], sro_split.inputs['Color'])
+            sro_split = nodes.new('ShaderNodeSeparateColor')
+            links.new(sro_split.outputs['Red'], shader_nodes.principled_bsdf_input(bsdf_node, 'Specular'))
+            links.new(sro_split.outputs['Green'], bsdf_node.inputs['Roughness'])
+            links.new(sro_split.outputs['Blue'], ao_mix_node.inputs[shader_nodes.MIX_RGBA_INPUT_B])
+            links.new(img_node.outputs['Color'], sro_split.inputs['Color'])
         case TextureMapTypes.MROH:
             # MRO components
-            mroh_split = mat.node_tree.nodes.new('ShaderNodeSeparateColor')
-            mat.node_tree.links.new(mroh_split.outputs['Red'], bsdf_node.inputs['Metallic'])
-            mat.node_tree.links.new(mroh_split.outputs['Green'], bsdf_node.inputs['Roughness'])
-            mat.node_tree.links.new(mroh_split.outputs['Blue'], ao_mix_node.inputs[7])
-            mat.node_tree.links.new(img_node.outputs['Color'], mroh_split.inputs['Color'])
+            mroh_split = nodes.new('ShaderNodeSeparateColor')
+            links.new(mroh_split.outputs['Red'], bsdf_node.inputs['Metallic'])
+            links.new(mroh_split.outputs['Green'], bsdf_node.inputs['Roughness'])
+            links.new(mroh_split.outputs['Blue'], ao_mix_node.inputs[shader_nodes.MIX_RGBA_INPUT_B])
+            links.new(img_node.outputs['Color'], mroh_split.inputs['Color'])
 
             # height component
-            displacement_node = mat.node_tree.nodes.new('ShaderNodeDisplacement')
-            mat.node_tree.links.new(displacement_node.outputs['Displacement'],
-                                    out_node.inputs['Displacement'])
-            mat.node_tree.links.new(img_node.outputs['Alpha'],
-                                    displacement_node.inputs['Height'])
+            displacement_node = nodes.new('ShaderNodeDisplacement')
+            links.new(displacement_node.outputs['Displacement'], out_node.inputs['Displacement'])
+            links.new(img_node.outputs['Alpha'], displacement_node.inputs['Height'])
         case TextureMapTypes.MRO:
-            mro_split = mat.node_tree.nodes.new('ShaderNodeSeparateColor')
-            mat.node_tree.links.new(mro_split.outputs['Red'], bsdf_node.inputs['Metallic'])
-            mat.node_tree.links.new(mro_split.outputs['Green'], bsdf_node.inputs['Roughness'])
-            mat.node_tree.links.new(mro_split.outputs['Blue'], ao_mix_node.inputs[7])
-            mat.node_tree.links.new(img_node.outputs['Color'], mro_split.inputs['Color'])
+            mro_split = nodes.new('ShaderNodeSeparateColor')
+            links.new(mro_split.outputs['Red'], bsdf_node.inputs['Metallic'])
+            links.new(mro_split.outputs['Green'], bsdf_node.inputs['Roughness'])
+            links.new(mro_split.outputs['Blue'], ao_mix_node.inputs[shader_nodes.MIX_RGBA_INPUT_B])
+            links.new(img_node.outputs['Color'], mro_split.inputs['Color'])
 
 
 def handle_material_texture_simple(mat: bpy.types.Material,
@@ -127,9 +128,11 @@ def handle_material_texture_simple(mat: bpy.types.Material,
                                    bsdf_node: bpy.types.ShaderNodeBsdfDiffuse):
     _state_buffer[mat].bsdf_node = bsdf_node
 
-    mat.node_tree.links.new(img_node.outputs['Color'], bsdf_node.inputs['Color'])
+    nodes = mat.node_tree.nodes
+    links = mat.node_tree.links
+    links.new(img_node.outputs['Color'], bsdf_node.inputs['Color'])
     img_node.select = True
-    mat.node_tree.nodes.active = img_node
+    nodes.active = img_node
 
 
 def end_process_material(mat: bpy.types.Material):
@@ -137,11 +140,12 @@ def end_process_material(mat: bpy.types.Material):
 
     if mat_ctx.use_pbr and mat_ctx.bsdf_node is not None:
         # set defaults
-        mat_ctx.bsdf_node.inputs[4].default_value = 1.01  # Subsurface IOR
-        mat_ctx.bsdf_node.inputs[7].default_value = 0.0  # Specular
-        mat_ctx.bsdf_node.inputs[9].default_value = 0.0  # Roughness
-        mat_ctx.bsdf_node.inputs[13].default_value = 0.0  # Sheen Tint
-        mat_ctx.bsdf_node.inputs[15].default_value = 0.0  # Clearcoat roughness
+        bsdf_node = mat_ctx.bsdf_node
+        shader_nodes.set_principled_bsdf_default(bsdf_node, 'Subsurface IOR', 1.01)
+        shader_nodes.set_principled_bsdf_default(bsdf_node, 'Specular', 0.0)
+        shader_nodes.set_principled_bsdf_default(bsdf_node, 'Roughness', 0.0)
+        shader_nodes.set_principled_bsdf_default(bsdf_node, 'Sheen Tint', 0.0)
+        shader_nodes.set_principled_bsdf_default(bsdf_node, 'Clearcoat Roughness', 0.0)
 
     del _state_buffer[mat]
 
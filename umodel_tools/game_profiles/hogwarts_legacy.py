@@ -10,6 +10,8 @@ import dataclasses
 import bpy
 import lark
 
+from .. import shader_nodes
+
 
 GAME_NAME = "Hogwarts Legacy"
 GAME_DESCRIPTION = "Hogwarts Legacy (2023) by Portkey Games"
@@ -127,6 +129,9 @@ def handle_material_texture_pbr(mat: bpy.types.Material,
     mat_ctx = _state_buffer[mat]
     mat_ctx.bsdf_node = bsdf_node
 
+    nodes = mat.node_tree.nodes
+    links = mat.node_tree.links
+
     bl_tex_type = TEXTURE_PARAM_NAME_TRS.get(tex_type.lower())
 
     # do not connect the same texture twice
@@ -138,44 +143,40 @@ def handle_material_texture_pbr(mat: bpy.types.Material,
 
     match bl_tex_type:
         case TextureMapTypes.Diffuse:
-            mat.node_tree.links.new(img_node.outputs['Color'], ao_mix_node.inputs[6])
-            mat.node_tree.links.new(img_node.outputs['Alpha'], bsdf_node.inputs['Alpha'])
+            links.new(img_node.outputs['Color'], ao_mix_node.inputs[shader_nodes.MIX_RGBA_INPUT_A])
+            links.new(img_node.outputs['Alpha'], bsdf_node.inputs['Alpha'])
             img_node.select = True
-            mat.node_tree.nodes.active = img_node
+            nodes.active = img_node
             mat_ctx.diffuse_connected = True
 
         case TextureMapTypes.Normal:
-            normal_map_node = mat.node_tree.nodes.new('ShaderNodeNormalMap')
-            mat.node_tree.links.new(normal_map_node.outputs['Normal'],
-                                    bsdf_node.inputs['Normal'])
-            mat.node_tree.links.new(img_node.outputs['Color'],
-                                    normal_map_node.inputs['Color'])
+            normal_map_node = nodes.new('ShaderNodeNormalMap')
+            links.new(normal_map_node.outputs['Normal'], bsdf_node.inputs['Normal'])
+            links.new(img_node.outputs['Color'], normal_map_node.inputs['Color'])
         case TextureMapTypes.SRO:
-            sro_split = mat.node_tree.nodes.new('ShaderNodeSeparateColor')
-            mat.node_tree.links.new(sro_split.outputs['Red'], bsdf_node.inputs['Specular'])
-            mat.node_tree.links.new(sro_split.outputs['Green'], bsdf_node.inputs['Roughness'])
-            mat.node_tree.links.new(sro_split.outputs['Blue'], ao_mix_node.inputs[7])
-            mat.node_tree.links.new(img_node.outputs['Color'], sro_split.inputs['Color'])
+            sro_split = nodes.new('ShaderNodeSeparateColor')
+            links.new(sro_split.outputs['Red'], shader_nodes.principled_bsdf_input(bsdf_node, 'Specular'))
+            links.new(sro_split.outputs['Green'], bsdf_node.inputs['Roughness'])
+            links.new(sro_split.outputs['Blue'], ao_mix_node.inputs[shader_nodes.MIX_RGBA_INPUT_B])
+            links.new(img_node.outputs['Color'], sro_split.inputs['Color'])
         case TextureMapTypes.MROH:
             # MRO components
-            mroh_split = mat.node_tree.nodes.new('ShaderNodeSeparateColor')
-            mat.node_tree.links.new(mroh_split.outputs['Red'], bsdf_node.inputs['Metallic'])
-            mat.node_tree.links.new(mroh_split.outputs['Green'], bsdf_node.inputs['Roughness'])
-            mat.node_tree.links.new(mroh_split.outputs['Blue'], ao_mix_node.inputs[7])
-            mat.node_tree.links.new(img_node.outputs['Color'], mroh_split.inputs['Color'])
+            mroh_split = nodes.new('ShaderNodeSeparateColor')
+            links.new(mroh_split.outputs['Red'], bsdf_node.inputs['Metallic'])
+            links.new(mroh_split.outputs['Green'], bsdf_node.inputs['Roughness'])
+            links.new(mroh_split.outputs['Blue'], ao_mix_node.inputs[shader_nodes.MIX_RGBA_INPUT_B])
+            links.new(img_node.outputs['Color'], mroh_split.inputs['Color'])
 
             # height component
-            displacement_node = mat.node_tree.nodes.new('ShaderNodeDisplacement')
-            mat.node_tree.links.new(displacement_node.outputs['Displacement'],
-                                    out_node.inputs['Displacement'])
-            mat.node_tree.links.new(img_node.outputs['Alpha'],
-                                    displacement_node.inputs['Height'])
+            displacement_node = nodes.new('ShaderNodeDisplacement')
+            links.new(displacement_node.outputs['Displacement'], out_node.inputs['Displacement'])
+            links.new(img_node.outputs['Alpha'], displacement_node.inputs['Height'])
         case TextureMapTypes.MRO:
-            mro_split = mat.node_tree.nodes.new('ShaderNodeSeparateColor')
-            mat.node_tree.links.new(mro_split.outputs['Red'], bsdf_node.inputs['Metallic'])
-            mat.node_tree.links.new(mro_split.outputs['Green'], bsdf_node.inputs['Roughness'])
-            mat.node_tree.links.new(mro_split.outputs['Blue'], ao_mix_node.inputs[7])
-            mat.node_tree.links.new(img_node.outputs['Color'], mro_split.inputs['Color'])
+            mro_split = nodes.new('ShaderNodeSeparateColor')
+            links.new(mro_split.outputs['Red'], bsdf_node.inputs['Metallic'])
+            links.new(mro_split.outputs['Green'], bsdf_node.inputs['Roughness'])
+            links.new(mro_split.outputs['Blue'], ao_mix_node.inputs[shader_nodes.MIX_RGBA_INPUT_B])
+            links.new(img_node.outputs['Color'], mro_split.inputs['Color'])
 
         case TextureMapTypes.WEAR_MSK:
             mat_ctx.msk_index += 1
@@ -188,38 +189,39 @@ def handle_material_texture_pbr(mat: bpy.types.Material,
             color2 = mask_colors.get(f'color {mat_ctx.msk_index + 2}')
             color3 = mask_colors.get(f'color {mat_ctx.msk_index + 3}')
 
-            msk_split = mat.node_tree.nodes.new('ShaderNodeSeparateColor')
+            msk_split = nodes.new('ShaderNodeSeparateColor')
 
-            b_mix = mat.node_tree.nodes.new('ShaderNodeMix')
+            b_mix = nodes.new('ShaderNodeMix')
             b_mix.data_type = 'RGBA'
             b_mix.blend_type = 'MIX'
-            b_mix.inputs[6].default_value = color1 if color1 is not None else (0, 0, 1, 1)
-            b_mix.inputs[7].default_value = (0, 0, 0, 1)
+            b_mix.inputs[shader_nodes.MIX_RGBA_INPUT_A].default_value = color1 if color1 is not None else (0, 0, 1, 1)
+            b_mix.inputs[shader_nodes.MIX_RGBA_INPUT_B].default_value = (0, 0, 0, 1)
 
-            g_mix = mat.node_tree.nodes.new('ShaderNodeMix')
+            g_mix = nodes.new('ShaderNodeMix')
             g_mix.data_type = 'RGBA'
             g_mix.blend_type = 'MIX'
-            g_mix.inputs[7].default_value = color2 if color2 is not None else (0, 1, 0, 1)
+            g_mix.inputs[shader_nodes.MIX_RGBA_INPUT_B].default_value = color2 if color2 is not None else (0, 1, 0, 1)
 
-            r_mix = mat.node_tree.nodes.new('ShaderNodeMix')
+            r_mix = nodes.new('ShaderNodeMix')
             r_mix.data_type = 'RGBA'
             r_mix.blend_type = 'MIX'
-            r_mix.inputs[7].default_value = color3 if color3 is not None else (1, 0, 0, 1)
+            r_mix.inputs[shader_nodes.MIX_RGBA_INPUT_B].default_value = color3 if color3 is not None else (1, 0, 0, 1)
 
-            mat.node_tree.links.new(img_node.outputs['Color'], msk_split.inputs['Color'])
-            mat.node_tree.links.new(msk_split.outputs['Red'], r_mix.inputs[0])
-            mat.node_tree.links.new(msk_split.outputs['Green'], g_mix.inputs[0])
-            mat.node_tree.links.new(msk_split.outputs['Blue'], b_mix.inputs[0])
+            links.new(img_node.outputs['Color'], msk_split.inputs['Color'])
+            links.new(msk_split.outputs['Red'], r_mix.inputs[shader_nodes.MIX_FACTOR_INPUT])
+            links.new(msk_split.outputs['Green'], g_mix.inputs[shader_nodes.MIX_FACTOR_INPUT])
+            links.new(msk_split.outputs['Blue'], b_mix.inputs[shader_nodes.MIX_FACTOR_INPUT])
 
             # connect mix nodes
-            mat.node_tree.links.new(b_mix.outputs[2], g_mix.inputs[6])
-            mat.node_tree.links.new(g_mix.outputs[2], r_mix.inputs[6])
+            links.new(b_mix.outputs[shader_nodes.MIX_RGBA_OUTPUT], g_mix.inputs[shader_nodes.MIX_RGBA_INPUT_A])
+            links.new(g_mix.outputs[shader_nodes.MIX_RGBA_OUTPUT], r_mix.inputs[shader_nodes.MIX_RGBA_INPUT_A])
 
             if not mat_ctx.diffuse_connected:
-                mat.node_tree.links.new(r_mix.outputs[2], ao_mix_node.inputs[6])
-                mat.node_tree.links.new(img_node.outputs['Alpha'], bsdf_node.inputs['Alpha'])
+                links.new(r_mix.outputs[shader_nodes.MIX_RGBA_OUTPUT],
+                          ao_mix_node.inputs[shader_nodes.MIX_RGBA_INPUT_A])
+                links.new(img_node.outputs['Alpha'], bsdf_node.inputs['Alpha'])
                 img_node.select = True
-                mat.node_tree.nodes.active = img_node
+                nodes.active = img_node
 
             mat_ctx.msk_index += 1
 
@@ -231,9 +233,11 @@ def handle_material_texture_simple(mat: bpy.types.Material,
                                    bsdf_node: bpy.types.ShaderNodeBsdfDiffuse):
     _state_buffer[mat].bsdf_node = bsdf_node
 
-    mat.node_tree.links.new(img_node.outputs['Color'], bsdf_node.inputs['Color'])
+    nodes = mat.node_tree.nodes
+    links = mat.node_tree.links
+    links.new(img_node.outputs['Color'], bsdf_node.inputs['Color'])
     img_node.select = True
-    mat.node_tree.nodes.active = img_node
+    nodes.active = img_node
 
 
 def end_process_material(mat: bpy.types.Material):
@@ -241,11 +245,12 @@ def end_process_material(mat: bpy.types.Material):
 
     if mat_ctx.use_pbr and mat_ctx.bsdf_node is not None:
         # set defaults
-        mat_ctx.bsdf_node.inputs[4].default_value = 1.01  # Subsurface IOR
-        mat_ctx.bsdf_node.inputs[7].default_value = 0.0  # Specular
-        mat_ctx.bsdf_node.inputs[9].default_value = 0.0  # Roughness
-        mat_ctx.bsdf_node.inputs[13].default_value = 0.0  # Sheen Tint
-        mat_ctx.bsdf_node.inputs[15].default_value = 0.0  # Clearcoat roughness
+        bsdf_node = mat_ctx.bsdf_node
+        shader_nodes.set_principled_bsdf_default(bsdf_node, 'Subsurface IOR', 1.01)
+        shader_nodes.set_principled_bsdf_default(bsdf_node, 'Specular', 0.0)
+        shader_nodes.set_principled_bsdf_default(bsdf_node, 'Roughness', 0.0)
+        shader_nodes.set_principled_bsdf_default(bsdf_node, 'Sheen Tint', 0.0)
+        shader_nodes.set_principled_bsdf_default(bsdf_node, 'Clearcoat Roughness', 0.0)
 
     del _state_buffer[mat]
 
@@ -278,7 +283,9 @@ def _get_mask_colors(ast: lark.Tree) -> dict[str, Color]:
                     param_info, param_val, _ = tex_param.children  # ParameterInfo, ParameterValue, ParameterName
                     _, _, color_vec = param_val.children
 
-                    color_name = param_info.children[2].children[0].children[2].children[0].value.strip()
+                    # first constant of ParameterInfo is the parameter name
+                    name_const = next(node for node in param_info.iter_subtrees_topdown() if node.data == 'const')
+                    color_name = name_const.children[0].value.strip()
 
                     # ignore unused materials
                     if color_vec.data != 'structured_block':
@@ -161,8 +161,7 @@ class StaticMesh:
 
         objpath = split_object_path(object_path)
 
-        self.asset_path = os.path.normpath(objpath + ".uasset")
-        self.asset_path = self.asset_path[1:] if self.asset_path.startswith(os.sep) else self.asset_path
+        self.asset_path = utils.normalize_game_path(objpath + ".uasset")
 
         match entity_type:
             case 'StaticMeshComponent':
@@ -596,14 +595,14 @@ class MapImporter(asset_importer.AssetImporter):
                     umodel_export_dir: str,
                     asset_dir: str,
                     game_profile: str,
-                    db: t.Optional[asset_db.AssetDB] = None) -> bool:
+                    db: asset_db.AssetDB) -> bool:
         """Imports map placements to the current scene.
 
         :param map_path: Path to FModel .json output representing a .umap file.
         :param umodel_export_dir: UModel output directory.
         :param asset_dir: Asset library directory.
         :param game_profile: Current game profile.
-        :param db: Asset database.
+        :param db: Asset database. Changes are kept in memory, saving is up to the caller.
         :return: True if succesful, else False.
         """
 
@@ -7,7 +7,6 @@ import tqdm
 import tqdm.contrib
 import bpy
 import bpy_extras.io_utils
-import mathutils as mu
 
 from . import utils
 from . import asset_importer
@@ -16,8 +15,127 @@ from . import map_importer
 from . import preferences
 
 
-def _get_object_aabb_verts(obj: bpy.types.Object) -> list[tuple[float, float, float]]:
-    return [obj.matrix_world @ mu.Vector(corner) for corner in obj.bound_box]
+def _get_object_aabb_verts(obj: bpy.types.Object) -> np.ndarray:
+    """Compute world space corners of the object's bounding box.
+
+    :param obj: Blender object.
+    :return: (8, 3) array of bounding box corners.
+    """
+    corners = np.empty((8, 4))
+    corners[:, :3] = obj.bound_box
+    corners[:, 3] = 1.0
+    return corners @ np.asarray(obj.matrix_world).T[:, :3]
+
+
+def _get_object_world_verts(obj: bpy.types.Object) -> np.ndarray:
+    """Read vertex coordinates of a mesh object in world space.
+
+    :param obj: Blender object with mesh data.
+    :return: (N, 3) array of vertex coordinates in world space.
+    """
+    mtx = np.asarray(obj.matrix_world).T
+    return _get_mesh_verts(obj.data) @ mtx[:3, :3] + mtx[3, :3]
+
+
+def _get_object_world_bounds_points(obj: bpy.types.Object, depsgraph: bpy.types.Depsgraph) -> np.ndarray:
+    """Collect world space points spanning the evaluated geometry of an object (modifiers included).
+    Objects without geometry convertible to a mesh, or with an empty one, fall back to their bounding box corners.
+
+    :param obj: Blender object of any type.
+    :param depsgraph: Dependency graph to evaluate the object with.
+    :return: (N, 3) array of points, N > 0.
+    """
+    obj_eval = obj.evaluated_get(depsgraph)
+
+    try:
+        mesh = obj_eval.to_mesh()
+
+        if mesh is not None and len(mesh.vertices):
+            mtx = np.asarray(obj_eval.matrix_world).T
+            return _get_mesh_verts(mesh) @ mtx[:3, :3] + mtx[3, :3]
+    except RuntimeError:
+        pass
+    finally:
+        obj_eval.to_mesh_clear()
+
+    return _get_object_aabb_verts(obj_eval)
+
+
+def _collect_model_paths(root_dir: str) -> list[str]:
+    """Recursively collect paths of .psk/.pskx files in a directory in a single pass.
+
+    :param root_dir: Directory to search.
+    :return: List of model file paths.
+    """
+    model_paths = []
+    dirs = [root_dir]
+
+    while dirs:
+        subdirs = []
+        files = []
+
+        # unreadable directories are skipped as a whole, as os.walk does
+        try:
+            with os.scandir(dirs.pop()) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirs.append(entry.path)
+                    elif entry.name.endswith(('.psk', '.pskx')):
+                        files.append(entry.path)
+        except OSError:
+            continue
+
+        model_paths.extend(files)
+
+        # visit subdirectories in listing order
+        dirs.extend(reversed(subdirs))
+
+    return model_paths
+
+
+def _homog(verts: np.ndarray) -> np.ndarray:
+    """Convert points to homogeneous coordinates.
+
+    :param verts: (N, 3) array of points.
+    :return: (N, 4) array of points with the last coordinate set to 1.
+    """
+    verts_h = np.empty((verts.shape[0], 4))
+    verts_h[:, :3] = verts
+    verts_h[:, 3] = 1.0
+    return verts_h
+
+
+def _aabb_affine(src_verts: np.ndarray, tgt_verts: np.ndarray) -> np.ndarray:
+    """Compute the affine transform mapping the axis aligned bounding box of one point set onto another's.
+    The transform only scales along the axes and translates, so it is derived from the box extents directly.
+
+    :param src_verts: (N, 3) array of source points.
+    :param tgt_verts: (M, 3) array of target points.
+    :return: 4x4 matrix A such that homogeneous source points multiplied by A land in the target box.
+    """
+    src_min, src_max = src_verts.min(axis=0), src_verts.max(axis=0)
+    tgt_min, tgt_max = tgt_verts.min(axis=0), tgt_verts.max(axis=0)
+
+    src_extent = src_max - src_min
+
+    # keep the scale of flat axes as any value fits them
+    scale = np.divide(tgt_max - tgt_min, src_extent, out=np.ones(3), where=src_extent > 0)
+
+    A = np.eye(4)
+    A[:3, :3] = np.diag(scale)
+    A[3, :3] = (tgt_min + tgt_max) / 2 - scale * (src_min + src_max) / 2
+    return A
+
+
+def _get_mesh_verts(mesh: bpy.types.Mesh) -> np.ndarray:
+    """Read vertex coordinates of a mesh in bulk.
+
+    :param mesh: Blender mesh.
+    :return: (N, 3) array of vertex coordinates in object space.
+    """
+    verts = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+    mesh.vertices.foreach_get('co', verts)
+    return verts.reshape(-1, 3)
 
 
 class UMODELTOOLS_OT_recover_unreal_asset(asset_importer.AssetImporter, bpy.types.Operator):
@@ -39,6 +157,7 @@ class UMODELTOOLS_OT_recover_unreal_asset(asset_importer.AssetImporter, bpy.type
 
     def execute(self, context: bpy.types.Context) -> set[str]:
         self._unrecognized_texture_types.clear()
+        self._ensured_dirs.clear()
 
         if not self.asset_path:
             return self._op_message('ERROR', "Asset path was not provided.")
@@ -49,8 +168,7 @@ class UMODELTOOLS_OT_recover_unreal_asset(asset_importer.AssetImporter, bpy.type
         if profile is None:
             return self._op_message('ERROR', "You need to have an active game profile selected.")
 
-        umodel_export_dir: str = os.path.normpath(profile.umodel_export_dir)
-        umodel_export_dir = umodel_export_dir[1:] if umodel_export_dir.startswith(os.sep) else umodel_export_dir
+        umodel_export_dir = utils.normalize_dir_path(profile.umodel_export_dir)
 
         if not umodel_export_dir:
             return self._op_message('ERROR', "You need to specify a UModel export dir in Scene properties.")
@@ -58,8 +176,7 @@ class UMODELTOOLS_OT_recover_unreal_asset(asset_importer.AssetImporter, bpy.type
         if not os.path.isdir(umodel_export_dir):
             return self._op_message('ERROR', f"Path to UModel export dir {umodel_export_dir} does not exist.")
 
-        asset_dir: str = os.path.normpath(profile.asset_dir)
-        asset_dir = asset_dir[1:] if asset_dir.startswith(os.sep) else asset_dir
+        asset_dir = utils.normalize_dir_path(profile.asset_dir)
 
         if not asset_dir:
             return self._op_message('ERROR', "You need to specify an asset dir in Scene properties.")
@@ -67,10 +184,15 @@ class UMODELTOOLS_OT_recover_unreal_asset(asset_importer.AssetImporter, bpy.type
         if not os.path.isdir(asset_dir):
             return self._op_message('ERROR', f"Path to asset dir {asset_dir} does not exist.")
 
-        asset_path = os.path.normpath(self.asset_path)
-        asset_path = asset_path[1:] if asset_path.startswith(os.sep) else asset_path
-        asset = self._load_asset(context=context, asset_dir=asset_dir, asset_path=asset_path,
-                                 umodel_export_dir=umodel_export_dir, game_profile=profile.game)
+        asset_path = utils.normalize_game_path(self.asset_path)
+
+        db = asset_db.AssetDB(asset_dir)
+        try:
+            asset = self._load_asset(context=context, asset_dir=asset_dir, asset_path=asset_path,
+                                     umodel_export_dir=umodel_export_dir, game_profile=profile.game, db=db)
+            db.save_db()
+        finally:
+            self._release_material_templates()
 
         if asset is None:
             self._op_message('ERROR', "Failed to import asset.")
@@ -80,20 +202,26 @@ class UMODELTOOLS_OT_recover_unreal_asset(asset_importer.AssetImporter, bpy.type
 
         # attempt replacing selected object with an asset
         if context.selected_objects:
+            # the asset is the same for every selected object, so the least squares fit
+            # reduces to a product with the pseudo-inverse computed once per point set
+            X_verts_pinv = None
+            X_aabb_pinv = np.linalg.pinv(_homog(_get_object_aabb_verts(asset)))
+
             for obj in context.selected_objects:
 
                 if utils.compare_meshes(asset_mesh, obj.data):
-                    vtx_source = np.array([v.co for v in asset_mesh.vertices])
-                    vtx_target = np.array([obj.matrix_world @ v.co for v in obj.data.vertices])
+                    if X_verts_pinv is None:
+                        X_verts_pinv = np.linalg.pinv(_homog(_get_mesh_verts(asset_mesh)))
+
+                    X_pinv = X_verts_pinv
+                    vtx_target = _get_object_world_verts(obj)
                 else:
-                    vtx_source = np.array(_get_object_aabb_verts(asset))
-                    vtx_target = np.array(_get_object_aabb_verts(obj))
+                    X_pinv = X_aabb_pinv
+                    vtx_target = _get_object_aabb_verts(obj)
 
-                pad = lambda x: np.hstack([x, np.ones((x.shape[0], 1))])
-                X = pad(vtx_source)
-                Y = pad(vtx_target)
+                Y = _homog(vtx_target)
 
-                A, _, _, _ = np.linalg.lstsq(X, Y, rcond=1)
+                A = X_pinv @ Y
 
                 obj.hide_set(True)
 
@@ -143,6 +271,7 @@ class UMODELTOOLS_OT_import_unreal_assets(asset_importer.AssetImporter, bpy.type
             return self._op_message('ERROR', "Asset path was not provided.")
 
         self._unrecognized_texture_types.clear()
+        self._ensured_dirs.clear()
 
         selected_objects: t.Sequence[selected_objects] = context.selected_objects
 
@@ -150,8 +279,7 @@ class UMODELTOOLS_OT_import_unreal_assets(asset_importer.AssetImporter, bpy.type
         if profile is None:
             return self._op_message('ERROR', "You need to have an active game profile selected.")
 
-        umodel_export_dir: str = os.path.normpath(profile.umodel_export_dir)
-        umodel_export_dir = umodel_export_dir[1:] if umodel_export_dir.startswith(os.sep) else umodel_export_dir
+        umodel_export_dir = utils.normalize_dir_path(profile.umodel_export_dir)
 
         if not umodel_export_dir:
             return self._op_message('ERROR', "You need to specify a UModel export dir in Scene properties.")
@@ -159,8 +287,7 @@ class UMODELTOOLS_OT_import_unreal_assets(asset_importer.AssetImporter, bpy.type
         if not os.path.isdir(umodel_export_dir):
             return self._op_message('ERROR', f"Path to UModel export dir {umodel_export_dir} does not exist.")
 
-        asset_dir: str = os.path.normpath(profile.asset_dir)
-        asset_dir = asset_dir[1:] if asset_dir.startswith(os.sep) else asset_dir
+        asset_dir = utils.normalize_dir_path(profile.asset_dir)
 
         if not asset_dir:
             return self._op_message('ERROR', "You need to specify an asset dir in Scene properties.")
@@ -168,35 +295,29 @@ class UMODELTOOLS_OT_import_unreal_assets(asset_importer.AssetImporter, bpy.type
         if not os.path.isdir(asset_dir):
             return self._op_message('ERROR', f"Path to asset dir {asset_dir} does not exist.")
 
-        asset_sub_dir = os.path.normpath(self.asset_sub_dir)
-        asset_sub_dir = asset_sub_dir[1:] if asset_sub_dir.startswith(os.sep) else asset_sub_dir
-        asset_sub_dir_abs = os.path.join(umodel_export_dir, asset_sub_dir)
+        asset_sub_dir = utils.normalize_game_path(self.asset_sub_dir)
+        asset_sub_dir_abs = os.path.normpath(os.path.join(umodel_export_dir, asset_sub_dir))
 
         if not os.path.isdir(asset_sub_dir_abs):
             return self._op_message('ERROR', f"Path {asset_sub_dir_abs} does not exist.")
 
-        # count assets to be imported for progress bar display purposes
-        total_models = 0
-        for root, _, files in os.walk(asset_sub_dir_abs):
-            for file in files:
-                _, ext = os.path.splitext(file)
-                if ext not in {'.psk', '.pskx'}:
-                    continue
+        # collect assets first to know the total for progress bar display purposes
+        model_paths = _collect_model_paths(asset_sub_dir_abs)
 
-                total_models += 1
+        umodel_export_dir_prefix = umodel_export_dir + os.sep
 
         db = asset_db.AssetDB(asset_dir)
-        with utils.std_out_err_redirect_tqdm() as orig_stdout:
-            with tqdm.tqdm(total=total_models, file=orig_stdout, dynamic_ncols=True, ascii=True,
-                           desc="Importing assets") as progress_bar:
-                for root, _, files in os.walk(asset_sub_dir_abs):
-                    for file in files:
-                        file_base, ext = os.path.splitext(file)
-                        if ext not in {'.psk', '.pskx'}:
-                            continue
-
-                        file_abs = os.path.join(root, file_base) + '.uasset'
-                        file_rel = os.path.relpath(file_abs, umodel_export_dir)
+        try:
+            with utils.std_out_err_redirect_tqdm() as orig_stdout:
+                with tqdm.tqdm(total=len(model_paths), file=orig_stdout, dynamic_ncols=True, ascii=True,
+                               desc="Importing assets") as progress_bar:
+                    for model_path in model_paths:
+                        file_abs = os.path.splitext(model_path)[0] + '.uasset'
+
+                        if file_abs.startswith(umodel_export_dir_prefix):
+                            file_rel = file_abs[len(umodel_export_dir_prefix):]
+                        else:
+                            file_rel = os.path.relpath(file_abs, umodel_export_dir)
 
                         print(f"\n\nImporting asset {file_rel}...")
                         self._load_asset(context=context,
@@ -209,7 +330,9 @@ class UMODELTOOLS_OT_import_unreal_assets(asset_importer.AssetImporter, bpy.type
 
                         progress_bar.update(1)
 
-        db.save_db()
+            db.save_db()
+        finally:
+            self._release_material_templates()
 
         self._print_unrecognized_textures()
 
@@ -246,14 +369,14 @@ class UMODELTOOLS_OT_import_unreal_map(map_importer.MapImporter, bpy.types.Opera
 
     def execute(self, context: bpy.types.Context) -> set[str]:
         self._unrecognized_texture_types.clear()
+        self._ensured_dirs.clear()
         selected_objects: t.Sequence[selected_objects] = context.selected_objects
 
         profile = preferences.get_addon_preferences().get_active_profile()
         if profile is None:
             return self._op_message('ERROR', "You need to have an active game profile selected.")
 
-        umodel_export_dir: str = os.path.normpath(profile.umodel_export_dir)
-        umodel_export_dir = umodel_export_dir[1:] if umodel_export_dir.startswith(os.sep) else umodel_export_dir
+        umodel_export_dir = utils.normalize_dir_path(profile.umodel_export_dir)
 
         if not umodel_export_dir:
             return self._op_message('ERROR', "You need to specify a UModel export dir in Scene properties.")
@@ -261,8 +384,7 @@ class UMODELTOOLS_OT_import_unreal_map(map_importer.MapImporter, bpy.types.Opera
         if not os.path.isdir(umodel_export_dir):
             return self._op_message('ERROR', f"Path to UModel export dir {umodel_export_dir} does not exist.")
 
-        asset_dir: str = os.path.normpath(profile.asset_dir)
-        asset_dir = asset_dir[1:] if asset_dir.startswith(os.sep) else asset_dir
+        asset_dir = utils.normalize_dir_path(profile.asset_dir)
 
         if not asset_dir:
             return self._op_message('ERROR', "You need to specify an asset dir in Scene properties.")
@@ -272,11 +394,14 @@ class UMODELTOOLS_OT_import_unreal_map(map_importer.MapImporter, bpy.types.Opera
 
         db = asset_db.AssetDB(asset_dir)
 
-        for file in self.files:
-            self._import_map(context=context, umodel_export_dir=umodel_export_dir, asset_dir=asset_dir, db=db,
-                             map_path=os.path.join(self.directory, file.name), game_profile=profile.game)
+        try:
+            for file in self.files:
+                self._import_map(context=context, umodel_export_dir=umodel_export_dir, asset_dir=asset_dir, db=db,
+                                 map_path=os.path.join(self.directory, file.name), game_profile=profile.game)
 
-        db.save_db()
+            db.save_db()
+        finally:
+            self._release_material_templates()
 
         self._print_unrecognized_textures()
 
@@ -313,43 +438,17 @@ class UMODELTOOLS_OT_realign_asset(bpy.types.Operator):
 
         bpy.ops.object.select_all(action='DESELECT')
 
-        asset_obj_copy = utils.copy_object(asset_obj)
-        target_obj_copy = utils.copy_object(target_obj)
-
-        context.collection.objects.link(asset_obj_copy)
-        context.collection.objects.link(target_obj_copy)
-
-        asset_obj_copy.select_set(True)
-        target_obj_copy.select_set(True)
-
-        bpy.ops.object.transform_apply(location=True, rotation=True, scale=True)
-
-        vtx_source = np.array(_get_object_aabb_verts(asset_obj_copy))
-        vtx_target = np.array(_get_object_aabb_verts(target_obj_copy))
+        depsgraph = context.evaluated_depsgraph_get()
+        A_aabb = _aabb_affine(_get_object_world_bounds_points(asset_obj, depsgraph),
+                              _get_object_world_bounds_points(target_obj, depsgraph))
 
-        pad = lambda x: np.hstack([x, np.ones((x.shape[0], 1))])
-        unpad = lambda x: x[:, :-1]
-        X = pad(vtx_source)
-        Y = pad(vtx_target)
-
-        A, _, _, _ = np.linalg.lstsq(X, Y, rcond=1)
-
-        transform = lambda x: unpad(pad(x) @ A)
-        transformed_verts = transform(np.array([v.co for v in asset_obj_copy.data.vertices]))
-        vtx_source_local = np.array([v.co for v in asset_obj.data.vertices])
-
-        X = pad(vtx_source_local)
-        Y = pad(transformed_verts)
-
-        A, _, _, _ = np.linalg.lstsq(X, Y, rcond=1)
+        # compose the world space correction with the current transform of the asset
+        A = np.asarray(asset_obj.matrix_world).T @ A_aabb
 
         target_obj.hide_set(True)
         asset_obj.matrix_world = A
         asset_obj.select_set(True)
 
-        bpy.data.objects.remove(asset_obj_copy, do_unlink=True)
-        bpy.data.objects.remove(target_obj_copy, do_unlink=True)
-
         return {'FINISHED'}
 
 
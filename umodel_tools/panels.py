@@ -1,6 +1,6 @@
 import bpy
 
-from .preferences import get_addon_preferences
+from .preferences import get_topbar_label
 
 
 class UMODELTOOLS_PT_asset(bpy.types.Panel):
@@ -42,13 +42,8 @@ def topbar_menu_func(menu: bpy.types.Menu, context: bpy.types.Context):
     if context.region.alignment != 'RIGHT':
         return
 
-    prefs = get_addon_preferences()
-
-    if not prefs.display_cur_profile:
-        return
-
-    cur_profile = prefs.get_active_profile()
-    menu.layout.label(text=f"UMT Active profile: {cur_profile.name if cur_profile else None}")
+    if label := get_topbar_label():
+        menu.layout.label(text=label)
 
 
 def bl_register() -> None:
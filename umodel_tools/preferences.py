@@ -14,13 +14,43 @@ def get_addon_preferences() -> 'UMODELTOOLS_AP_addon_preferences':
     return bpy.context.preferences.addons[PACKAGE_NAME].preferences
 
 
+#: Active profile label displayed in the top bar. Empty when hidden, None when it has to be rebuilt.
+_topbar_label: t.Optional[str] = None
+
+
+def _invalidate_topbar_label(*_) -> None:
+    global _topbar_label  # pylint: disable=global-statement
+    _topbar_label = None
+
+
+def get_topbar_label() -> str:
+    """Returns the active profile label displayed in the top bar.
+    The label is cached and only rebuilt after the relevant preferences change.
+
+    :return: Label text or an empty string if the label should not be displayed.
+    """
+    global _topbar_label  # pylint: disable=global-statement
+
+    if _topbar_label is None:
+        prefs = get_addon_preferences()
+
+        if prefs.display_cur_profile:
+            cur_profile = prefs.get_active_profile()
+            _topbar_label = f"UMT Active profile: {cur_profile.name if cur_profile else None}"
+        else:
+            _topbar_label = ""
+
+    return _topbar_label
+
+
 class UMODELTOOLS_PG_game_profile(bpy.types.PropertyGroup):
     """Game profile settings
     """
 
     name: bpy.props.StringProperty(
         name="Name",
-        description="Name of the profile"
+        description="Name of the profile",
+        update=_invalidate_topbar_label
     )
 
     game: bpy.props.EnumProperty(
@@ -103,6 +133,8 @@ class UMODELTOOLS_OT_actions(bpy.types.Operator):
             profile.name = "New Profile"
             addon_prefs.active_profile_index = len(addon_prefs.profiles) - 1
 
+        _invalidate_topbar_label()
+
         return {"FINISHED"}
 
 
@@ -119,13 +151,15 @@ class UMODELTOOLS_AP_addon_preferences(bpy.types.AddonPreferences):
     )
 
     active_profile_index: bpy.props.IntProperty(
-        default=0
+        default=0,
+        update=_invalidate_topbar_label
     )
 
     display_cur_profile: bpy.props.BoolProperty(
         name="Display current profile",
         description="Display current profile on top of Blender's window",
-        default=True
+        default=True,
+        update=_invalidate_topbar_label
     )
 
     verbose: bpy.props.BoolProperty(
@@ -1,17 +1,136 @@
 import os
+import re
+import sys
+import dataclasses
 import typing as t
 
 import lark
 
 from . import utils
 
+try:
+    # generated from props_txt_grammar.lark by build.py
+    from . import props_txt_standalone
+except ImportError:
+    props_txt_standalone = None
 
-with open(os.path.join(os.path.dirname(__file__), 'props_txt_grammar.lark'), mode='r', encoding='utf-8') as grammar_f:
-    lark_parser = lark.Lark(grammar_f, parser='earley', propagate_positions=True, ambiguity='resolve')
+
+#: Lark implementation the parser comes from. Trees can only be transformed with the same implementation.
+_lark = props_txt_standalone if props_txt_standalone is not None else lark
+
+_MeshProps: t.TypeAlias = tuple[t.Optional[lark.Tree], list[str]]
+_MaterialProps: t.TypeAlias = tuple[lark.Tree, dict[str, str], dict[str, str | float | bool]]
+
+#: Parser instance, built on first use to keep grammar compilation out of add-on loading.
+_lark_parser: t.Optional[lark.Lark] = None
+
+#: Parse errors raised by either the standalone or the lark-built parser.
+_PARSE_ERRORS: tuple[type[Exception], ...] = (lark.UnexpectedInput, )
+if props_txt_standalone is not None:
+    _PARSE_ERRORS += (props_txt_standalone.UnexpectedInput, )
+
+
+def _get_lark_parser() -> lark.Lark:
+    """Returns the props.txt parser, building it on the first call.
+    The standalone parser generated at build time is preferred, the grammar is only compiled when it is missing.
+
+    :return: Lark parser.
+    """
+    global _lark_parser  # pylint: disable=global-statement
+
+    if _lark_parser is not None:
+        return _lark_parser
+
+    if props_txt_standalone is not None:
+        _lark_parser = props_txt_standalone.Lark_StandAlone()
+    else:
+        with open(os.path.join(os.path.dirname(__file__), 'props_txt_grammar.lark'),
+                  mode='r', encoding='utf-8') as grammar_f:
+            _lark_parser = lark.Lark(grammar_f, parser='lalr', propagate_positions=True, cache=True)
+
+    return _lark_parser
+
+
+#: Top level ``Materials[N] = { ... }`` block of a mesh props.txt.
+_MESH_MATERIALS_RE = re.compile(r"^Materials\[\d+\]\s*=\s*\{([^{}]*)\}", re.MULTILINE)
+#: Entry of the ``Materials`` block.
+_MESH_MATERIAL_ENTRY_RE = re.compile(r"^\s*Materials\[\d+\]\s*=\s*(?:[A-Za-z_]\w*'([^']*)'\s*$)?", re.MULTILINE)
+
+
+def _scan_mesh_material_paths(text: str) -> t.Optional[list[str]]:
+    """Scans mesh props.txt for material paths without building a parse tree.
+
+    :param text: Contents of a props.txt file.
+    :return: Material paths, or None if the file does not have the expected layout and needs to be fully parsed.
+    """
+    blocks = _MESH_MATERIALS_RE.findall(text)
+
+    if not blocks:
+        return None
+
+    material_paths = []
+
+    for block in blocks:
+        for material_path in _MESH_MATERIAL_ENTRY_RE.findall(block):
+            # entry that is not a path
+            if not material_path:
+                return None
+
+            material_paths.append(sys.intern(material_path))
+
+    return material_paths
+
+
+@dataclasses.dataclass
+class _Definition:
+    """Definition of a named value, e.g. ``Name[Index] = Value``.
+    """
+
+    name: str
+    index: t.Optional[str]
+    value: t.Union[str, '_Path', list['_Definition'], list[str]]
+
+
+@dataclasses.dataclass
+class _Path:
+    """Reference to a game object, e.g. ``Texture2D'/Game/Textures/T_Rock_D.T_Rock_D'``.
+    """
+
+    path_type: str
+    path: str
+
+
+class _PropsTransformer(_lark.Transformer):
+    """Converts a props.txt AST into definitions. Structured blocks become lists of definitions,
+    lists become lists of strings and constants become strings.
+    """
+
+    def start(self, children: list[_Definition]) -> list[_Definition]:
+        return children
+
+    def definition(self, children: list) -> _Definition:
+        name, index, value = children
+        return _Definition(name=name.value, index=index.value if index is not None else None, value=value)
+
+    def structured_block(self, children: list[_Definition]) -> list[_Definition]:
+        return children
+
+    def path(self, children: list) -> _Path:
+        path_type, path_value = children
+        return _Path(path_type=path_type.value, path=sys.intern(path_value.value[1:-1]))
+
+    def const_list(self, children: list[str]) -> list[str]:
+        return children
+
+    def empty_list(self, _children: list) -> list[str]:
+        return []
+
+    def const(self, children: list) -> str:
+        return children[0].value.strip()
 
 
 @t.overload
-def parse_props_txt(props_txt_path: str, mode: t.Literal['MESH']) -> tuple[lark.Tree, list[str]]:
+def parse_props_txt(props_txt_path: str, mode: t.Literal['MESH']) -> tuple[t.Optional[lark.Tree], list[str]]:
     ...
 
 
@@ -24,9 +143,10 @@ def parse_props_txt(props_txt_path: str,
 
 def parse_props_txt(props_txt_path: str,
                     mode: t.Literal['MESH'] | t.Literal['MATERIAL']
-                    ) -> tuple[lark.Tree, list[str]] | tuple[lark.Tree, dict[str, str], dict[str, str | float | bool]]:
+                    ) -> _MeshProps | _MaterialProps:
     """Parses props.txt file (UModel output) and returns either a list of material paths, or a list of texture paths
     depending on the mode. Note, the mode should be used appropriately depending on the origin of the file.
+    In the MESH mode material paths are scanned for directly when possible, the returned AST is None then.
 
     :param props_txt_path: Path to the prop.txt file.
     :param mode: Mode of parsing, either mesh properties or texture properties.
@@ -37,36 +157,34 @@ def parse_props_txt(props_txt_path: str,
     """
     utils.verbose_print(f"Parsing {props_txt_path}...")
 
-    with open(props_txt_path, mode='r', encoding='utf-8') as f:
-        text = f.read()
+    # binary read skips newline translation, the grammar accepts CRLF line endings as is
+    with open(props_txt_path, mode='rb') as f:
+        text = f.read().decode('utf-8')
+
+        if mode == 'MESH' and (material_paths := _scan_mesh_material_paths(text)) is not None:
+            return None, material_paths
 
         try:
-            ast = lark_parser.parse(text)
-        except lark.UnexpectedInput as e:
+            ast = _get_lark_parser().parse(text)
+        except _PARSE_ERRORS as e:
             raise RuntimeError(f"ERROR: Failed parsing {props_txt_path}.") from e
 
+        props = _PropsTransformer().transform(ast)
+
         match mode:
             case 'MESH':
                 material_paths = []
 
-                for child in ast.children:
-                    assert child.data == 'definition'
-                    def_name, array_qual, value = child.children
-
-                    if def_name != 'Materials':
+                for definition in props:
+                    if definition.name != 'Materials':
                         continue
 
-                    assert array_qual is not None
-                    assert value.data == 'structured_block'
+                    assert definition.index is not None
+                    assert isinstance(definition.value, list)
 
-                    for path_entry in value.children:
-                        assert path_entry.data == 'definition'
-                        _, _, path_desc = path_entry.children
-
-                        assert path_desc.data == 'path'
-
-                        _, path_value = path_desc.children
-                        material_paths.append(path_value.children[0].value[1:][:-1])
+                    for path_entry in definition.value:
+                        assert isinstance(path_entry.value, _Path)
+                        material_paths.append(path_entry.value.path)
 
                 return ast, material_paths
 
@@ -74,51 +192,40 @@ def parse_props_txt(props_txt_path: str,
                 texture_infos = {}
                 base_prop_overrides = None
 
-                for child in ast.children:
-                    assert child.data == 'definition'
-                    def_name, array_qual, value = child.children
-
-                    match def_name:
+                for definition in props:
+                    match definition.name:
                         case 'TextureParameterValues':
-                            assert array_qual is not None
-                            assert value.data == 'structured_block'
+                            assert definition.index is not None
+                            assert isinstance(definition.value, list)
 
-                            for tex_param_def in value.children:
-                                _, _, tex_param = tex_param_def.children
-                                param_info, param_val, _ = tex_param.children
-                                _, _, path_desc = param_val.children
+                            for tex_param_def in definition.value:
+                                param_info, param_val, _ = tex_param_def.value
 
                                 # ignore unused materials
-                                if path_desc.data != 'path':
+                                if not isinstance(param_val.value, _Path):
                                     continue
 
-                                _, path_value = path_desc.children
-
-                                tex_path = path_value.children[0].value[1:][:-1]
-                                tex_type = param_info.children[2].children[0].children[2].children[0].value.strip()
-
-                                texture_infos[tex_type] = tex_path
+                                # texture types come from a small set and are used as dict keys
+                                tex_type = sys.intern(param_info.value[0].value)
+                                texture_infos[tex_type] = param_val.value.path
                         case 'BasePropertyOverrides':
-                            assert array_qual is None
-                            assert value.data == 'structured_block'
+                            assert definition.index is None
+                            assert isinstance(definition.value, list)
 
                             base_prop_overrides = {}
 
-                            for prop_override_entry in value.children:
-                                prop_name, _, prop_value = prop_override_entry.children
-                                prop_name = prop_name.value
-
-                                match prop_name:
+                            for prop_override in definition.value:
+                                match prop_override.name:
                                     case 'BlendMode':
-                                        prop_value = prop_value.children[0].value.strip()
+                                        prop_value = prop_override.value
                                     case 'TwoSided':
-                                        prop_value = prop_value.children[0].value == 'true'
+                                        prop_value = prop_override.value == 'true'
                                     case 'OpacityMaskClipValue':
-                                        prop_value = float(prop_value.children[0].value)
+                                        prop_value = float(prop_override.value)
                                     case _:
                                         continue
 
-                                base_prop_overrides[prop_name] = prop_value
+                                base_prop_overrides[prop_override.name] = prop_value
 
                 return ast, texture_infos, base_prop_overrides
 
@@ -0,0 +1,64 @@
+"""This module holds helpers to address shader node sockets in a Blender version independent way.
+"""
+
+import bpy
+
+
+#: ``ShaderNodeMix`` keeps a separate set of sockets per data type with identical names,
+#: so its RGBA sockets can only be addressed by index.
+MIX_FACTOR_INPUT = 0
+MIX_RGBA_INPUT_A = 6
+MIX_RGBA_INPUT_B = 7
+MIX_RGBA_OUTPUT = 2
+
+#: Principled BSDF sockets renamed between Blender versions. Names are tried in order.
+_PRINCIPLED_BSDF_SOCKET_ALIASES = {
+    'Specular': ('Specular', 'Specular IOR Level'),
+    'Clearcoat Roughness': ('Clearcoat Roughness', 'Coat Roughness'),
+}
+
+#: Colors equivalent to 3.x values of Principled BSDF sockets that became colors in Blender 4.0.
+#: In 3.x sheen tint blends from white to the base color, so no tint is plain white.
+_PRINCIPLED_BSDF_COLOR_VALUES = {
+    ('Sheen Tint', 0.0): (1.0, 1.0, 1.0, 1.0),
+}
+
+#: Principled BSDF input socket indices by name. Populated from the first node passed to ``principled_bsdf_input``.
+_principled_bsdf_inputs: dict[str, int] = {}
+
+
+def principled_bsdf_input(bsdf: bpy.types.ShaderNodeBsdfPrincipled, name: str) -> bpy.types.NodeSocket:
+    """Return an input socket of a Principled BSDF node by name.
+    The socket layout is read once, subsequent lookups are resolved by index.
+
+    :param bsdf: Principled BSDF node.
+    :param name: Socket name (as in Blender 3.x).
+    :raises KeyError: Raised when the socket does not exist in the running Blender version.
+    :return: Input socket.
+    """
+    if not _principled_bsdf_inputs:
+        for i, socket in enumerate(bsdf.inputs):
+            _principled_bsdf_inputs.setdefault(socket.name, i)
+
+    for socket_name in _PRINCIPLED_BSDF_SOCKET_ALIASES.get(name, (name, )):
+        if (idx := _principled_bsdf_inputs.get(socket_name)) is not None:
+            return bsdf.inputs[idx]
+
+    raise KeyError(name)
+
+
+def set_principled_bsdf_default(bsdf: bpy.types.ShaderNodeBsdfPrincipled, name: str, value: float) -> None:
+    """Set the default value of a Principled BSDF input socket. Values given for sockets that became colors
+    in the running Blender version are converted to the equivalent color.
+
+    :param bsdf: Principled BSDF node.
+    :param name: Socket name (as in Blender 3.x).
+    :param value: Socket value (as in Blender 3.x).
+    :raises KeyError: Raised when the socket does not exist, or the value has no color equivalent.
+    """
+    socket = principled_bsdf_input(bsdf, name)
+
+    if socket.type == 'RGBA':
+        socket.default_value = _PRINCIPLED_BSDF_COLOR_VALUES[(name, value)]
+    else:
+        socket.default_value = value
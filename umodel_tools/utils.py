@@ -2,6 +2,7 @@ import os
 import sys
 import typing as t
 import tempfile
+import functools
 import contextlib
 
 import bpy
@@ -10,22 +11,23 @@ import tqdm
 from . import preferences
 
 
-tmphandle, tmppath = tempfile.mkstemp()
-#: Determines whether the OS's filesystem is case sensitive or not
-FS_CASE_INSENSITIVE = os.path.exists(tmppath.upper())
-os.close(tmphandle)
-os.remove(tmppath)
+def _probe_fs_case_insensitive() -> bool:
+    """Checks whether the filesystem of the temporary directory is case insensitive.
 
+    :return: True if the filesystem is case insensitive, else False.
+    """
+    tmphandle, tmppath = tempfile.mkstemp()
 
-def copy_object(obj: bpy.types.Object) -> bpy.types.Object:
-    """Copies an object and its mesh. No linking is performed.
+    try:
+        return os.path.exists(tmppath.upper())
+    finally:
+        os.close(tmphandle)
+        os.remove(tmppath)
 
-    :param obj: Blender object.
-    :return: Copied object.
-    """
-    copied_obj = obj.copy()
-    copied_obj.data = obj.data.copy()
-    return copied_obj
+
+#: Determines whether the OS's filesystem is case sensitive or not.
+#: Windows and macOS filesystems are case insensitive by default, others are probed.
+FS_CASE_INSENSITIVE = sys.platform in {'win32', 'darwin'} or _probe_fs_case_insensitive()
 
 
 def compare_meshes(first: bpy.types.Mesh, second: bpy.types.Mesh) -> bool:
@@ -42,22 +44,145 @@ def compare_meshes(first: bpy.types.Mesh, second: bpy.types.Mesh) -> bool:
             and len(first.edges) == len(second.edges))
 
 
-def compare_paths(first: str, second: str) -> bool:
+@functools.lru_cache(maxsize=4096)
+def _abs_path_compare_key(path: str) -> str:
+    """Converts an absolute path to the form used for comparison. Only depends on the path itself, so it is cached.
+
+    :param path: Absolute path.
+    :return: Normalized path, lowercased on case insensitive filesystems.
+    """
+    path = os.path.normcase(os.path.normpath(path))
+    return path.lower() if FS_CASE_INSENSITIVE else path
+
+
+def _path_compare_key(path: str, strict: bool = False) -> str:
+    """Converts a path to the form used for comparison. Respects OS case sensitivity rules for the filesystem.
+
+    :param path: Path.
+    :param strict: Resolve symlinks, which requires filesystem access. Otherwise the path is only normalized.
+    :return: Absolute path, lowercased on case insensitive filesystems.
+    """
+    if strict:
+        # symlinks may change at any time, so resolved paths are never cached
+        path = os.path.realpath(path)
+        return path.lower() if FS_CASE_INSENSITIVE else path
+
+    # relative paths depend on the current working directory
+    return _abs_path_compare_key(path if os.path.isabs(path) else os.path.abspath(path))
+
+
+def compare_paths(first: str, second: str, strict: bool = False) -> bool:
     """Compares that to paths are identical. Respects OS case sensitivity rules for the filesystem.
 
     :param first: First path.
     :param second: Second path.
+    :param strict: Resolve symlinks before comparing, otherwise paths are compared after normalization only.
     :return: True if paths are identical, else False.
     """
-    first = os.path.realpath(first)
-    second = os.path.realpath(second)
+    return _path_compare_key(first, strict) == _path_compare_key(second, strict)
 
-    return (first.lower() == second.lower()) if FS_CASE_INSENSITIVE else (first == second)
+
+def normalize_game_path(path: str) -> str:
+    """Normalize a path in game format and make it relative by stripping leading separators.
+
+    :param path: Path in game format (e.g. ``/Game/Meshes/SM_Rock``).
+    :return: Normalized relative path.
+    """
+    return os.path.normpath(path).lstrip(os.sep)
+
+
+def normalize_dir_path(path: str) -> str:
+    """Normalize a directory path from add-on settings and strip a single leading separator, as the operators
+    always did.
+
+    :param path: Directory path.
+    :return: Normalized path.
+    """
+    path = os.path.normpath(path)
+    return path[1:] if path.startswith(os.sep) else path
 
 
 DataBlock: t.TypeAlias = bpy.types.Object | bpy.types.Material | bpy.types.Image
 
 
+#: Names and filepaths of linked libraries by their path compare key.
+_library_index: dict[str, tuple[str, str]] = {}
+
+#: Number of linked libraries at the time the index was last brought up to date.
+_library_index_size: int = -1
+
+
+def _rebuild_library_index() -> None:
+    """Indexes linked libraries not present in the index yet. Only done when the number of libraries has changed,
+    otherwise an unindexed library can not exist, barring renames or removals after undo. A missed library
+    is harmless, as loading it again reuses the already linked one.
+    """
+    # pylint: disable=global-statement
+    global _library_index_size
+
+    if len(bpy.data.libraries) == _library_index_size:
+        return
+
+    indexed_names = {lib_name for lib_name, _ in _library_index.values()}
+
+    for lib in bpy.data.libraries:
+        if lib.name not in indexed_names:
+            _library_index.setdefault(_path_compare_key(lib.filepath), (lib.name, lib.filepath))
+
+    _library_index_size = len(bpy.data.libraries)
+
+
+def index_linked_library(lib: bpy.types.Library) -> None:
+    """Adds a freshly linked library to the index, so it is found without rescanning all libraries.
+
+    :param lib: Linked library.
+    """
+    # pylint: disable=global-statement
+    global _library_index_size
+
+    _library_index[_path_compare_key(lib.filepath)] = (lib.name, lib.filepath)
+
+    # the index stays complete only if it was complete before the library got linked
+    if len(bpy.data.libraries) == _library_index_size + 1:
+        _library_index_size += 1
+
+
+def _clear_library_index() -> None:
+    """Invalidates the library index.
+    """
+    # pylint: disable=global-statement
+    global _library_index_size
+
+    _library_index.clear()
+    _library_index_size = -1
+
+
+@bpy.app.handlers.persistent
+def _on_load_post(*_: t.Any) -> None:
+    _clear_library_index()
+
+
+def _find_library(lib_filepath_key: str) -> t.Optional[bpy.types.Library]:
+    """Looks up a linked library in the index. The result is validated, as the index may be outdated.
+
+    :param lib_filepath_key: Path compare key of the library filepath.
+    :return: Library or None if it is not indexed.
+    """
+    if (entry := _library_index.get(lib_filepath_key)) is None:
+        return None
+
+    # libraries are looked up by name, references to Blender data do not survive undo or file loading
+    lib_name, lib_filepath = entry
+    lib = bpy.data.libraries.get(lib_name)
+
+    if lib is None or lib.filepath != lib_filepath:
+        # drop the stale entry, so the library can be indexed again
+        del _library_index[lib_filepath_key]
+        return None
+
+    return lib
+
+
 def linked_libraries_search(lib_filepath: str, dtype: t.Type[DataBlock]) -> t.Optional[DataBlock]:
     """Check already linked libraries for the associated data block and return it.
 
@@ -66,11 +191,19 @@ def linked_libraries_search(lib_filepath: str, dtype: t.Type[DataBlock]) -> t.Op
     :return: None or data-block (if found).
     """
 
-    for lib in bpy.data.libraries:
-        if compare_paths(lib.filepath, lib_filepath):
-            for id_data in lib.users_id:
-                if isinstance(id_data, dtype):
-                    return id_data
+    lib_filepath_key = _path_compare_key(lib_filepath)
+
+    lib = _find_library(lib_filepath_key)
+    if lib is None:
+        _rebuild_library_index()
+        lib = _find_library(lib_filepath_key)
+
+        if lib is None:
+            return None
+
+    for id_data in lib.users_id:
+        if isinstance(id_data, dtype):
+            return id_data
 
     return None
 
@@ -92,9 +225,6 @@ def std_out_err_redirect_tqdm():
     try:
         sys.stdout, sys.stderr = map(tqdm.contrib.DummyTqdmFile, orig_out_err)
         yield orig_out_err[0]
-    # Relay exceptions
-    except Exception as exc:
-        raise exc
     # Always restore sys.stdout/err if necessary
     finally:
         sys.stdout, sys.stderr = orig_out_err
@@ -128,3 +258,11 @@ def redirect_cstdout(to=os.devnull):
             _redirect_stdout(to=old_stdout)  # restore stdout
 
     return None
+
+
+def bl_register() -> None:
+    bpy.app.handlers.load_post.append(_on_load_post)
+
+
+def bl_unregister() -> None:
+    bpy.app.handlers.load_post.remove(_on_load_post)